@@ -5,7 +5,13 @@ import matplotlib.pyplot as plt
 import plotly.express as px
 
 from models.entities import Fleet
-from models.io_utils import read_table, build_fleet_from_df, build_products_from_df
+from models.io_utils import (
+    read_table,
+    build_fleet_from_df,
+    build_products_from_df,
+    normalize_fleet_columns,
+    to_internal_fleet_columns,
+)
 from models.validators import (
     validate_extension,
     validate_fleet_df,
@@ -70,40 +76,7 @@ with col_a:
                     st.write("Columnas leídas:", list(df.columns))
 
                     # --- (A) Normaliza a encabezados del DOC antes de validar ---
-                    import unicodedata, re
-
-                    def _canon(s: str) -> str:
-                        s = unicodedata.normalize("NFKD", str(s))
-                        s = "".join(ch for ch in s if not unicodedata.combining(ch))
-                        s = s.lower()
-                        s = s.replace("_", " ")
-                        s = re.sub(r"\s+", " ", s).strip()
-                        return s
-
-                    RAW_STANDARD = {
-                        # Tipo
-                        "tipo de camion": "tipo de camión",
-                        "tipo camion": "tipo de camión",
-                        "tipo": "tipo de camión",
-                        "tipo de camión": "tipo de camión",
-                        # Capacidad
-                        "peso que puede cargar (kg)": "peso que puede cargar (kg)",
-                        "peso que puede cargar": "peso que puede cargar (kg)",
-                        "capacidad (kg)": "peso que puede cargar (kg)",
-                        "capacidad": "peso que puede cargar (kg)",
-                        # Tarifa
-                        "tarifa por kilometro recorrido": "tarifa por kilómetro recorrido",
-                        "tarifa por kilómetro recorrido": "tarifa por kilómetro recorrido",
-                        "tarifa km": "tarifa por kilómetro recorrido",
-                        # Cantidad
-                        "cantidad": "cantidad",
-                        # Distancia (si viene, la ignoraremos luego)
-                        "distancia (km)": "distancia (km)",
-                        "distancia km": "distancia (km)",
-                        "distancia_km": "distancia (km)",
-                        "distancia": "distancia (km)",
-                    }
-                    df.columns = [RAW_STANDARD.get(_canon(c), c) for c in df.columns]
+                    df = normalize_fleet_columns(df)
 
                     # --- (B) Valida con los nombres del documento ---
                     ok2, msg2 = validate_fleet_df(df.copy())
@@ -111,17 +84,7 @@ with col_a:
                         st.error(msg2)
                     else:
                         # --- (C) Renombra a llaves internas para los modelos ---
-                        df = df.rename(
-                            columns={
-                                "tipo de camión": "tipo_camion",
-                                "peso que puede cargar (kg)": "capacidad_kg",
-                                "tarifa por kilómetro recorrido": "tarifa_km",
-                                "cantidad": "cantidad",
-                                "distancia (km)": "distancia_km",
-                            }
-                        )
-                        # (por si viene ya como 'distancia_km')
-                        df.columns = [c.strip().lower() for c in df.columns]
+                        df = to_internal_fleet_columns(df)
 
                         # 👇 Aquí ya se usa SOLO la distancia_global que escribió el usuario
                         fleet = build_fleet_from_df(
@@ -0,0 +1,132 @@
+from __future__ import annotations
+import zlib
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Tuple
+import numpy as np
+import pandas as pd
+from models.entities import ALLOWED_PRODUCTS
+
+TEMPLATES_DIR = Path(__file__).resolve().parent.parent / "assets" / "templates"
+
+# Parámetros base tomados de assets/templates
+BASE_CAPACIDADES = (3000.0, 7000.0, 20000.0)
+BASE_TARIFAS = (1.8, 2.5, 4.5)
+BASE_PRODUCTOS = {
+    "computadores portátiles": (2.0, 1500.0),
+    "computadores de escritorio": (8.0, 2500.0),
+    "televisores inteligentes": (12.0, 1800.0),
+    "smartphones": (0.3, 900.0),
+    "auriculares": (0.2, 60.0),
+    "neveras": (70.0, 1200.0),
+    "lavadoras": (65.0, 1000.0),
+    "estufas": (55.0, 800.0),
+}
+
+@dataclass
+class Scenario:
+    nombre: str
+    n_tipos: int          # tipos de camión distintos
+    n_camiones: int       # camiones en total
+    n_productos: int      # productos distintos (máx. len(ALLOWED_PRODUCTS))
+    n_unidades: int       # unidades en total
+    carga: float = 0.6    # peso total / capacidad total de la flota
+    pesados: bool = False # incluye productos que solo caben en el camión más grande
+
+# Escenarios por defecto: CBC prueba optimalidad muy por debajo del límite (con seed=0),
+# así tanto el tiempo de `solve` como el costo óptimo son comparables contra el baseline.
+SCENARIOS = [
+    Scenario("small", n_tipos=5, n_camiones=25, n_productos=8, n_unidades=1_000),
+    Scenario("medium", n_tipos=4, n_camiones=100, n_productos=8, n_unidades=10_000),
+    Scenario("heavy", n_tipos=3, n_camiones=60, n_productos=8, n_unidades=3_000, carga=0.7, pesados=True),
+    Scenario("near_capacity", n_tipos=3, n_camiones=100, n_productos=8, n_unidades=5_000, carga=0.95),
+]
+
+# Escenarios de estrés (--stress): el modelo es muy simétrico y CBC agota el límite de tiempo,
+# por lo que solo sirven para medir lectura, validación, construcción del modelo y métricas.
+STRESS_SCENARIOS = [
+    Scenario("large", n_tipos=12, n_camiones=2_000, n_productos=8, n_unidades=40_000),
+    Scenario("heavy_large", n_tipos=6, n_camiones=300, n_productos=8, n_unidades=10_000, carga=0.7, pesados=True),
+    Scenario("near_capacity_large", n_tipos=6, n_camiones=300, n_productos=8, n_unidades=10_000, carga=0.97),
+]
+
+def _floor2(v: np.ndarray) -> np.ndarray:
+    return np.maximum(np.floor(v * 100.0) / 100.0, 0.01)
+
+def _reparto(rng: np.random.Generator, total: int, partes: int) -> np.ndarray:
+    # Reparte `total` en `partes` enteros >= 1
+    extra = rng.multinomial(total - partes, rng.dirichlet(np.ones(partes)))
+    return extra + 1
+
+def generate_fleet(rng: np.random.Generator, sc: Scenario) -> pd.DataFrame:
+    if sc.n_camiones < sc.n_tipos:
+        raise ValueError("n_camiones debe ser >= n_tipos.")
+    base = np.array(BASE_CAPACIDADES)
+    capacidades = np.round(rng.choice(base, size=sc.n_tipos) * rng.uniform(0.7, 1.3, size=sc.n_tipos), 0)
+    # Un único tipo de máxima capacidad, para que el chequeo de "gran capacidad" sea significativo
+    capacidades[int(np.argmax(capacidades))] = capacidades.max() * 1.25
+    # Tarifa ~ proporcional a capacidad^0.6 (ajuste sobre la plantilla)
+    tarifas = np.round(BASE_TARIFAS[0] * (capacidades / base[0]) ** 0.6 * rng.uniform(0.9, 1.1, size=sc.n_tipos), 2)
+    return pd.DataFrame({
+        "tipo de camion": [f"tipo-{k + 1:03d}" for k in range(sc.n_tipos)],
+        "peso que puede cargar (kg)": capacidades,
+        "tarifa por kilometro recorrido": tarifas,
+        "cantidad": _reparto(rng, sc.n_camiones, sc.n_tipos),
+    })
+
+def generate_products(rng: np.random.Generator, sc: Scenario, fleet_df: pd.DataFrame) -> pd.DataFrame:
+    if not 1 <= sc.n_productos <= len(ALLOWED_PRODUCTS):
+        raise ValueError(f"n_productos debe estar entre 1 y {len(ALLOWED_PRODUCTS)}.")
+    if sc.n_unidades < sc.n_productos:
+        raise ValueError("n_unidades debe ser >= n_productos.")
+    # El validador solo admite ALLOWED_PRODUCTS sin duplicados: el catálogo escala hasta ese tope
+    nombres = [str(n) for n in rng.choice(ALLOWED_PRODUCTS, size=sc.n_productos, replace=False)]
+    pesos = np.array([BASE_PRODUCTOS[n][0] for n in nombres]) * rng.uniform(0.8, 1.2, size=sc.n_productos)
+    valores = np.round(np.array([BASE_PRODUCTOS[n][1] for n in nombres]) * rng.uniform(0.8, 1.2, size=sc.n_productos), 2)
+    cantidades = _reparto(rng, sc.n_unidades, sc.n_productos)
+
+    caps = fleet_df["peso que puede cargar (kg)"].to_numpy(dtype=float)
+    cant_veh = fleet_df["cantidad"].to_numpy(dtype=int)
+    capacidad_total = float((caps * cant_veh).sum())
+    max_cap = float(caps.max())
+    second_max = float(np.unique(caps)[-2]) if len(np.unique(caps)) >= 2 else max_cap
+
+    fijo = np.zeros(sc.n_productos, dtype=bool)
+    peso_fijo = 0.0
+    if sc.pesados:
+        # El producto más pesado solo cabe en el tipo de mayor capacidad y ocupa ~85% de esos camiones
+        k = int(np.argmax(pesos))
+        pesos[k] = rng.uniform(second_max * 1.05, max_cap * 0.95)
+        n_max = int(cant_veh[caps == max_cap].sum())
+        por_camion = int(max_cap // pesos[k])
+        cantidades[k] = max(1, int(n_max * por_camion * 0.85))
+        fijo[k] = True
+        peso_fijo = float(pesos[k] * cantidades[k])
+
+    # Escala los pesos libres para llegar a la carga objetivo sin superar al segundo camión más grande
+    objetivo = sc.carga * capacidad_total - peso_fijo
+    libre = float((pesos[~fijo] * cantidades[~fijo]).sum())
+    if libre > 0:
+        pesos[~fijo] = np.minimum(pesos[~fijo] * (objetivo / libre), second_max * 0.9)
+    pesos = _floor2(pesos)
+
+    return pd.DataFrame({
+        "Producto": nombres,
+        "Peso": pesos,
+        "Valor": valores,
+        "Cantidad": cantidades,
+    })
+
+def generate_instance(sc: Scenario, seed: int = 0) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    rng = np.random.default_rng([seed, zlib.crc32(sc.nombre.encode("utf-8"))])
+    fleet_df = generate_fleet(rng, sc)
+    return fleet_df, generate_products(rng, sc, fleet_df)
+
+def to_csv_bytes(df: pd.DataFrame) -> bytes:
+    return df.to_csv(index=False).encode("utf-8")
+
+def template_instance() -> Tuple[bytes, bytes]:
+    return (
+        (TEMPLATES_DIR / "flota_template.csv").read_bytes(),
+        (TEMPLATES_DIR / "productos_template.csv").read_bytes(),
+    )
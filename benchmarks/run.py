@@ -0,0 +1,286 @@
+from __future__ import annotations
+import argparse
+import json
+import platform
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Tuple
+import numpy as np
+import pandas as pd
+import pulp
+from models.io_utils import (
+    read_table,
+    build_fleet_from_df,
+    build_products_from_df,
+    normalize_fleet_columns,
+    to_internal_fleet_columns,
+)
+from models.validators import validate_extension, validate_fleet_df, validate_products_df
+from models.optimizer import Optimizer
+from models.metrics import compute_metrics_df, compute_totals
+from .generator import SCENARIOS, STRESS_SCENARIOS, generate_instance, template_instance, to_csv_bytes
+
+BASELINE_PATH = Path(__file__).resolve().parent / "baseline.json"
+
+STAGES = (
+    "read_table",
+    "validate_fleet_df",
+    "build_fleet_from_df",
+    "validate_products_df",
+    "build_products_from_df",
+    "model_build",
+    "solve",
+    "compute_metrics_df",
+)
+
+DISTANCIA_KM = 100.0
+
+# Metadatos que deben coincidir con el baseline para que la comparación sea válida
+META_ESTRICTA = ("seed", "time_limit", "pulp")
+
+# Orden de gravedad de pulp.LpSolution (mayor = peor)
+GRAVEDAD_SOL = {
+    "Optimal Solution Found": 0,
+    "Solution Found": 1,
+    "No Solution Found": 2,
+    "No Solution Exists": 3,
+    "Solution is Unbounded": 3,
+}
+
+class BenchmarkError(Exception):
+    pass
+
+def _timed(tiempos: Dict[str, float], stage: str, fn: Callable[[], Any]) -> Any:
+    t0 = time.perf_counter()
+    out = fn()
+    tiempos[stage] = tiempos.get(stage, 0.0) + (time.perf_counter() - t0)
+    return out
+
+def run_pipeline(fleet_bytes: bytes, products_bytes: bytes, time_limit: float | None) -> Tuple[Dict[str, float], Dict[str, Any]]:
+    # Mismos pasos que app.py, cronometrados por etapa
+    t: Dict[str, float] = {}
+
+    def _read():
+        validate_extension("flota.csv")
+        validate_extension("productos.csv")
+        return read_table(fleet_bytes, "flota.csv"), read_table(products_bytes, "productos.csv")
+    df_fleet, df_products = _timed(t, "read_table", _read)
+
+    df_fleet = normalize_fleet_columns(df_fleet)
+    ok, msg = _timed(t, "validate_fleet_df", lambda: validate_fleet_df(df_fleet.copy()))
+    if not ok:
+        raise BenchmarkError(f"Flota inválida: {msg}")
+    df_fleet = to_internal_fleet_columns(df_fleet)
+    fleet = _timed(t, "build_fleet_from_df", lambda: build_fleet_from_df(df_fleet.copy(), distancia_global_km=DISTANCIA_KM))
+
+    ok, msg = _timed(t, "validate_products_df", lambda: validate_products_df(df_products.copy(), fleet))
+    if not ok:
+        raise BenchmarkError(f"Productos inválidos: {msg}")
+    df_products.columns = [c.strip().lower() for c in df_products.columns]
+    products = _timed(t, "build_products_from_df", lambda: build_products_from_df(df_products.copy()))
+
+    opt = Optimizer(products, fleet, time_limit=time_limit)
+    model = _timed(t, "model_build", opt.build)
+    result = _timed(t, "solve", lambda: opt.solve(*model))
+    # Si CBC agota el límite sin solución, x queda vacío: se registra el status y se sigue midiendo.
+    # PuLP reporta status="Optimal" también para el incumbente de una corrida cortada por tiempo;
+    # sol_status distingue "Optimal Solution Found" de "Solution Found"/"No Solution Found".
+    resuelto = result.status in ("Optimal", "Feasible")
+    limite_alcanzado = time_limit is not None and (
+        result.sol_status in ("Solution Found", "No Solution Found") or t["solve"] >= time_limit
+    )
+    df_metrics = _timed(t, "compute_metrics_df", lambda: compute_metrics_df(products, fleet.vehicles, result.x))
+
+    _, pct_general, costo_total, _ = compute_totals(df_metrics)
+    info = {
+        "status": result.status,
+        "sol_status": result.sol_status,
+        "limite_alcanzado": limite_alcanzado,
+        "costo_total": costo_total if resuelto else None,
+        "porcentaje_capacidad": pct_general if resuelto else None,
+        "vehiculos_usados": sum(result.y.values()),
+        "camiones": len(fleet.vehicles),
+        "productos": len(products),
+        "unidades": sum(p.cantidad for p in products),
+        "variables": len(products) * len(fleet.vehicles) + len(fleet.vehicles),
+    }
+    return t, info
+
+def peor_repeticion(infos: List[Dict[str, Any]]) -> Dict[str, Any]:
+    # Se reporta la repetición más desfavorable completa, para que status, sol_status,
+    # costo y límite de tiempo describan la misma corrida
+    def clave(info):
+        costo = info["costo_total"] if info["costo_total"] is not None else float("inf")
+        return (GRAVEDAD_SOL.get(info["sol_status"], 3), info["limite_alcanzado"], costo)
+    return max(infos, key=clave)
+
+def _instances(nombres: List[str] | None, seed: int, stress: bool):
+    if nombres is None or "template" in nombres:
+        yield "template", template_instance()
+    for sc in SCENARIOS + STRESS_SCENARIOS:
+        por_defecto = sc in SCENARIOS or stress
+        if (nombres is None and por_defecto) or (nombres is not None and sc.nombre in nombres):
+            fleet_df, products_df = generate_instance(sc, seed=seed)
+            yield sc.nombre, (to_csv_bytes(fleet_df), to_csv_bytes(products_df))
+
+def run_suite(nombres: List[str] | None = None, seed: int = 0, repeat: int = 3, time_limit: float | None = 20.0,
+              stress: bool = False) -> Dict[str, Any]:
+    if repeat < 1:
+        raise ValueError("repeat debe ser >= 1.")
+    resultados: Dict[str, Any] = {}
+    for nombre, (fleet_bytes, products_bytes) in _instances(nombres, seed, stress):
+        muestras: List[Dict[str, float]] = []
+        infos: List[Dict[str, Any]] = []
+        for _ in range(repeat):
+            tiempos, info = run_pipeline(fleet_bytes, products_bytes, time_limit)
+            muestras.append(tiempos)
+            infos.append(info)
+        info = dict(peor_repeticion(infos))
+        info["limite_alcanzado"] = any(i["limite_alcanzado"] for i in infos)  # basta una repetición cortada por tiempo
+        resultados[nombre] = dict(info, stages={s: statistics.median(m[s] for m in muestras) for s in STAGES})
+        print(f"{nombre}: {info['camiones']} camiones, {info['unidades']} unidades, "
+              f"{info['sol_status']}{' (límite de tiempo)' if info['limite_alcanzado'] else ''}, "
+              f"{sum(resultados[nombre]['stages'].values()):.3f}s", file=sys.stderr)
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "pulp": pulp.__version__,
+            "pandas": pd.__version__,
+            "numpy": np.__version__,
+            "seed": seed,
+            "repeat": repeat,
+            "time_limit": time_limit,
+        },
+        "scenarios": resultados,
+    }
+
+def check_meta(actual: Dict[str, Any], baseline: Dict[str, Any]) -> Tuple[List[str], List[str]]:
+    # Semilla, límite de CBC o versión de PuLP distintos invalidan la comparación; el resto solo se avisa
+    errores: List[str] = []
+    avisos: List[str] = []
+    for clave, valor in actual["meta"].items():
+        base = baseline["meta"].get(clave)
+        if base != valor:
+            (errores if clave in META_ESTRICTA else avisos).append(f"{clave}: {valor} vs baseline {base}")
+    return errores, avisos
+
+def coverage(actual: Dict[str, Any], baseline: Dict[str, Any]) -> Tuple[List[str], List[str]]:
+    # (escenarios corridos sin baseline, escenarios del baseline no corridos)
+    corridos = set(actual["scenarios"])
+    registrados = set(baseline.get("scenarios", {}))
+    return sorted(corridos - registrados), sorted(registrados - corridos)
+
+def merge_baseline(actual: Dict[str, Any], baseline: Dict[str, Any] | None) -> Dict[str, Any]:
+    # Actualiza solo los escenarios corridos; el resto del baseline se conserva.
+    # Con semilla/límite/PuLP distintos los escenarios viejos no son comparables: se exige corrida completa.
+    if baseline is None:
+        return actual
+    errores, _ = check_meta(actual, baseline)
+    _, faltantes = coverage(actual, baseline)
+    if errores and faltantes:
+        raise BenchmarkError(
+            "El baseline usa otros parámetros (" + "; ".join(errores) + ") y esta corrida no incluye: "
+            + ", ".join(faltantes) + ". Ejecute todos los escenarios (--stress) para reemplazarlo."
+        )
+    if errores:
+        return actual
+    return {"meta": actual["meta"], "scenarios": dict(baseline["scenarios"], **actual["scenarios"])}
+
+def compare(actual: Dict[str, Any], baseline: Dict[str, Any], tolerance: float, min_delta: float, cost_tolerance: float) -> List[str]:
+    # Regresión = etapa más lenta que baseline*(1+tolerance) y por más de min_delta segundos,
+    # un escenario que ya no termina dentro del límite de CBC, o un óptimo probado más caro
+    fallas: List[str] = []
+    for nombre, base in baseline.get("scenarios", {}).items():
+        cur = actual["scenarios"].get(nombre)
+        if cur is None:
+            continue
+        for stage, t_base in base["stages"].items():
+            t_cur = cur["stages"].get(stage)
+            if t_cur is None:
+                continue
+            if stage == "solve" and base["limite_alcanzado"]:
+                continue  # acotado por el límite: no puede superar la tolerancia
+            if t_cur > t_base * (1.0 + tolerance) and t_cur - t_base > min_delta:
+                fallas.append(f"{nombre}/{stage}: {t_cur:.4f}s vs baseline {t_base:.4f}s (+{(t_cur / t_base - 1) * 100:.0f}%)")
+        if cur["limite_alcanzado"] and not base["limite_alcanzado"]:
+            fallas.append(f"{nombre}: alcanzó el límite de tiempo de CBC ({cur['sol_status']}); "
+                          f"en el baseline terminó en {base['stages']['solve']:.2f}s")
+        elif not cur["limite_alcanzado"] and not base["limite_alcanzado"] and base["costo_total"] is not None:
+            # Solo óptimos probados: el costo no depende de la carga de la máquina
+            if cur["costo_total"] is None:
+                fallas.append(f"{nombre}: {cur['sol_status']} vs baseline {base['sol_status']}")
+            elif cur["costo_total"] > base["costo_total"] * (1.0 + cost_tolerance):
+                fallas.append(f"{nombre}: costo_total {cur['costo_total']:.2f} vs baseline {base['costo_total']:.2f}")
+    return fallas
+
+def _repeticiones(valor: str) -> int:
+    n = int(valor)
+    if n < 1:
+        raise argparse.ArgumentTypeError("debe ser >= 1")
+    return n
+
+def main(argv: List[str] | None = None) -> int:
+    nombres_validos = ["template"] + [sc.nombre for sc in SCENARIOS + STRESS_SCENARIOS]
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.run", description="Benchmark reproducible de TruckOptimizer")
+    parser.add_argument("--scenarios", nargs="+", choices=nombres_validos, help="Escenarios a ejecutar (por defecto todos salvo los de estrés)")
+    parser.add_argument("--stress", action="store_true", help="Incluye los escenarios de estrés (miles de camiones)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=_repeticiones, default=3, help="Repeticiones por escenario (se reporta la mediana)")
+    parser.add_argument("--time-limit", type=float, default=20.0, help="Límite de CBC por resolución (s)")
+    parser.add_argument("--output", type=Path, help="Archivo JSON de resultados (por defecto stdout)")
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PATH)
+    parser.add_argument("--update-baseline", action="store_true", help="Actualiza en el baseline los escenarios de esta corrida")
+    parser.add_argument("--tolerance", type=float, default=0.5, help="Holgura relativa de tiempo antes de fallar")
+    parser.add_argument("--min-delta", type=float, default=0.1, help="Diferencia mínima (s) para considerar regresión")
+    parser.add_argument("--cost-tolerance", type=float, default=1e-6, help="Holgura relativa del costo óptimo")
+    args = parser.parse_args(argv)
+
+    actual = run_suite(args.scenarios, seed=args.seed, repeat=args.repeat, time_limit=args.time_limit, stress=args.stress)
+    texto = json.dumps(actual, ensure_ascii=False, indent=2)
+    if args.output:
+        args.output.write_text(texto + "\n", encoding="utf-8")
+    else:
+        print(texto)
+
+    if args.update_baseline:
+        previo = json.loads(args.baseline.read_text(encoding="utf-8")) if args.baseline.exists() else None
+        try:
+            nuevo = merge_baseline(actual, previo)
+        except BenchmarkError as e:
+            print(f"ERROR: {e}", file=sys.stderr)
+            return 2
+        args.baseline.write_text(json.dumps(nuevo, ensure_ascii=False, indent=2) + "\n", encoding="utf-8")
+        print(f"Baseline actualizado ({', '.join(actual['scenarios'])}): {args.baseline}", file=sys.stderr)
+        return 0
+    if not args.baseline.exists():
+        print(f"ERROR: no existe el baseline {args.baseline}; genérelo con --update-baseline.", file=sys.stderr)
+        return 2
+
+    baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+    errores, avisos = check_meta(actual, baseline)
+    for a in avisos:
+        print(f"AVISO: entorno distinto al del baseline ({a}); los tiempos pueden no ser comparables.", file=sys.stderr)
+    if errores:
+        print("ERROR: el baseline no es comparable con esta corrida:", file=sys.stderr)
+        for e in errores:
+            print(f"  - {e}", file=sys.stderr)
+        print("Use los mismos parámetros/dependencias (requirements.txt) o regenere con --update-baseline.", file=sys.stderr)
+        return 2
+    sin_baseline, no_corridos = coverage(actual, baseline)
+    if no_corridos:
+        print(f"AVISO: escenarios del baseline no ejecutados: {', '.join(no_corridos)}.", file=sys.stderr)
+    fallas = [f"{nombre}: no está en el baseline; regístrelo con --update-baseline" for nombre in sin_baseline]
+    fallas += compare(actual, baseline, args.tolerance, args.min_delta, args.cost_tolerance)
+    if fallas:
+        print("REGRESIONES DE RENDIMIENTO:", file=sys.stderr)
+        for f in fallas:
+            print(f"  - {f}", file=sys.stderr)
+        return 1
+    print("Sin regresiones frente al baseline.", file=sys.stderr)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
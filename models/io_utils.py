@@ -1,5 +1,7 @@
 from __future__ import annotations
 import io
+import re
+import unicodedata
 import pandas as pd
 from typing import Tuple
 from .entities import Product, Vehicle, Fleet
@@ -25,6 +27,59 @@ def read_table(file_bytes: bytes, file_name: str) -> pd.DataFrame:
     else:
         raise ValueError("Formato o extensión de archivo no válido.")
 
+# Encabezados de flota aceptados -> encabezados del documento
+RAW_STANDARD = {
+    # Tipo
+    "tipo de camion": "tipo de camión",
+    "tipo camion": "tipo de camión",
+    "tipo": "tipo de camión",
+    "tipo de camión": "tipo de camión",
+    # Capacidad
+    "peso que puede cargar (kg)": "peso que puede cargar (kg)",
+    "peso que puede cargar": "peso que puede cargar (kg)",
+    "capacidad (kg)": "peso que puede cargar (kg)",
+    "capacidad": "peso que puede cargar (kg)",
+    # Tarifa
+    "tarifa por kilometro recorrido": "tarifa por kilómetro recorrido",
+    "tarifa por kilómetro recorrido": "tarifa por kilómetro recorrido",
+    "tarifa km": "tarifa por kilómetro recorrido",
+    # Cantidad
+    "cantidad": "cantidad",
+    # Distancia (si viene, la ignoraremos luego)
+    "distancia (km)": "distancia (km)",
+    "distancia km": "distancia (km)",
+    "distancia_km": "distancia (km)",
+    "distancia": "distancia (km)",
+}
+
+# Encabezados del documento -> llaves internas para los modelos
+FLEET_INTERNAL_COLUMNS = {
+    "tipo de camión": "tipo_camion",
+    "peso que puede cargar (kg)": "capacidad_kg",
+    "tarifa por kilómetro recorrido": "tarifa_km",
+    "cantidad": "cantidad",
+    "distancia (km)": "distancia_km",
+}
+
+def _canon(s: str) -> str:
+    s = unicodedata.normalize("NFKD", str(s))
+    s = "".join(ch for ch in s if not unicodedata.combining(ch))
+    s = s.lower()
+    s = s.replace("_", " ")
+    s = re.sub(r"\s+", " ", s).strip()
+    return s
+
+def normalize_fleet_columns(df: pd.DataFrame) -> pd.DataFrame:
+    # Normaliza a encabezados del DOC antes de validar
+    df.columns = [RAW_STANDARD.get(_canon(c), c) for c in df.columns]
+    return df
+
+def to_internal_fleet_columns(df: pd.DataFrame) -> pd.DataFrame:
+    # Renombra a llaves internas (por si viene ya como 'distancia_km')
+    df = df.rename(columns=FLEET_INTERNAL_COLUMNS)
+    df.columns = [c.strip().lower() for c in df.columns]
+    return df
+
 def build_fleet_from_df(df: pd.DataFrame, distancia_global_km: float | None = None):
     # Ya normalizado en validators
     # Esperamos columnas: tipo_camion, capacidad_kg, tarifa_km, cantidad.
@@ -5,17 +5,22 @@ import pulp
 from .entities import Product, Vehicle, Fleet
 
 class OptimizationResult:
-    def __init__(self, x: Dict[Tuple[int, int], int], y: Dict[int, int], status: str):
+    def __init__(self, x: Dict[Tuple[int, int], int], y: Dict[int, int], status: str, sol_status: str = ""):
         self.x = x  # unidades del producto i asignadas al vehículo j
         self.y = y  # 1 si se usa el vehículo j
         self.status = status
+        self.sol_status = sol_status  # p.ej. "Solution Found" si CBC se detuvo por tiempo sin probar optimalidad
 
 class Optimizer:
-    def __init__(self, products: List[Product], fleet: Fleet):
+    def __init__(self, products: List[Product], fleet: Fleet, time_limit: float | None = None):
         self.products = products
         self.fleet = fleet
+        self.time_limit = time_limit  # segundos máximos para CBC (None = sin límite)
 
     def build_and_solve(self) -> OptimizationResult:
+        return self.solve(*self.build())
+
+    def build(self):
         n_i = len(self.products)
         n_v = len(self.fleet.vehicles)
 
@@ -45,15 +50,22 @@ class Optimizer:
             for j in range(n_v):
                 prob += x[i][j] <= prod.cantidad, f"upper_x_{i}_{j}"
 
+        return prob, x, y
+
+    def solve(self, prob: pulp.LpProblem, x, y) -> OptimizationResult:
+        n_i = len(self.products)
+        n_v = len(self.fleet.vehicles)
+
         # Resolver
-        prob.solve(pulp.PULP_CBC_CMD(msg=False))
+        prob.solve(pulp.PULP_CBC_CMD(msg=False, timeLimit=self.time_limit))
 
         status = pulp.LpStatus[prob.status]
+        sol_status = pulp.LpSolution[prob.sol_status]
         x_sol: Dict[Tuple[int, int], int] = {}
         y_sol: Dict[int, int] = {}
 
         if status not in ("Optimal", "Feasible"):
-            return OptimizationResult(x_sol, y_sol, status)
+            return OptimizationResult(x_sol, y_sol, status, sol_status)
 
         for i in range(n_i):
             for j in range(n_v):
@@ -65,4 +77,4 @@ class Optimizer:
             val = int(round(pulp.value(y[j]) or 0))
             y_sol[j] = val
 
-        return OptimizationResult(x_sol, y_sol, status)
+        return OptimizationResult(x_sol, y_sol, status, sol_status)
@@ -0,0 +1,227 @@
+from __future__ import annotations
+import bisect
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Tuple
+import pandas as pd
+from .entities import Fleet, Product
+from .io_utils import (
+    build_fleet_from_df,
+    build_products_from_df,
+    normalize_fleet_columns,
+    to_internal_fleet_columns,
+)
+from .validators import validate_fleet_df, validate_products_df
+from .optimizer import Optimizer
+from .metrics import build_plan_text, compute_metrics_df, compute_totals
+
+# Límites (segundos) de los histogramas de latencia
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+class ServiceBusy(Exception):
+    # La cola de resoluciones está llena
+    pass
+
+class LatencyHistogram:
+    def __init__(self, buckets: Tuple[float, ...] = LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # último = +Inf
+        self.count = 0
+        self.total = 0.0
+
+    def observe(self, seconds: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+
+    def snapshot(self) -> Dict[str, Any]:
+        # Conteos acumulados por límite superior (estilo Prometheus)
+        acumulado = 0
+        buckets: Dict[str, int] = {}
+        for limite, n in zip([str(b) for b in self.buckets] + ["+Inf"], self.counts):
+            acumulado += n
+            buckets[limite] = acumulado
+        return {
+            "buckets": buckets,
+            "count": self.count,
+            "sum": self.total,
+            "mean": (self.total / self.count) if self.count else 0.0,
+        }
+
+class ServiceStats:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.latency: Dict[str, LatencyHistogram] = {}
+        self.requests: Dict[str, int] = {}
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.coalesced = 0
+        self.rejected = 0
+
+    def incr(self, counter: str) -> None:
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def observe(self, name: str, seconds: float) -> None:
+        with self._lock:
+            self.latency.setdefault(name, LatencyHistogram()).observe(seconds)
+            self.requests[name] = self.requests.get(name, 0) + 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.cache_hits + self.cache_misses + self.coalesced
+            return {
+                "requests": dict(self.requests),
+                "latency_seconds": {k: h.snapshot() for k, h in self.latency.items()},
+                "cache": {
+                    "hits": self.cache_hits,
+                    "misses": self.cache_misses,
+                    "coalesced": self.coalesced,
+                    # Coalescidas también se cuentan como aciertos: no lanzan otro solve
+                    "hit_rate": ((self.cache_hits + self.coalesced) / lookups) if lookups else 0.0,
+                },
+                "rejected": self.rejected,
+            }
+
+class SolveService:
+    def __init__(self, max_workers: int = 2, max_queue: int = 32, cache_size: int = 128):
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self.cache_size = cache_size
+        self.stats = ServiceStats()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="solver")
+        self._lock = threading.Lock()
+        self._inflight: Dict[str, Future] = {}
+        self._cache: "OrderedDict[str, Any]" = OrderedDict()
+        self._queued = 0
+        self._running = 0
+
+    def submit(self, key: str, fn: Callable[[], Any], cache_if: Callable[[Any], bool] | None = None) -> Future:
+        with self._lock:
+            if key in self._cache:
+                self._cache.move_to_end(key)
+                self.stats.incr("cache_hits")
+                fut: Future = Future()
+                fut.set_result(self._cache[key])
+                return fut
+            if key in self._inflight:
+                # Petición idéntica en curso: se comparte el mismo resultado
+                self.stats.incr("coalesced")
+                return self._inflight[key]
+            if self._queued >= self.max_queue:
+                self.stats.incr("rejected")
+                raise ServiceBusy("La cola de optimización está llena, intente más tarde.")
+            self.stats.incr("cache_misses")
+            self._queued += 1
+            fut = self._executor.submit(self._run, key, fn, cache_if, time.perf_counter())
+            self._inflight[key] = fut
+            return fut
+
+    def _run(self, key: str, fn: Callable[[], Any], cache_if: Callable[[Any], bool] | None, enqueued_at: float) -> Any:
+        with self._lock:
+            self._queued -= 1
+            self._running += 1
+        self.stats.observe("queue_wait", time.perf_counter() - enqueued_at)
+        t0 = time.perf_counter()
+        try:
+            result = fn()
+            if cache_if is not None and not cache_if(result):
+                return result
+            with self._lock:
+                self._cache[key] = result
+                self._cache.move_to_end(key)
+                while len(self._cache) > self.cache_size:
+                    self._cache.popitem(last=False)
+            return result
+        finally:
+            self.stats.observe("solve", time.perf_counter() - t0)
+            with self._lock:
+                self._running -= 1
+                self._inflight.pop(key, None)
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            estado = {
+                "workers": self.max_workers,
+                "max_queue": self.max_queue,
+                "queue_depth": self._queued,
+                "running": self._running,
+                "in_flight": len(self._inflight),
+                "cache_size": len(self._cache),
+            }
+        estado.update(self.stats.snapshot())
+        return estado
+
+    def shutdown(self) -> None:
+        # Las resoluciones en cola se cancelan; las que corren terminan por el límite de CBC
+        self._executor.shutdown(wait=True, cancel_futures=True)
+
+# Pipeline compartido (mismos pasos que la UI)
+def prepare_fleet(df: pd.DataFrame, distancia_global_km: float) -> Tuple[bool, str, pd.DataFrame | None, Fleet | None]:
+    df = normalize_fleet_columns(df)
+    ok, msg = validate_fleet_df(df.copy())
+    if not ok:
+        return False, msg, None, None
+    df = to_internal_fleet_columns(df)
+    fleet = build_fleet_from_df(df.copy(), distancia_global_km=distancia_global_km)
+    return True, "", df, fleet
+
+def prepare_products(df: pd.DataFrame, fleet: Fleet) -> Tuple[bool, str, pd.DataFrame | None, List[Product] | None]:
+    ok, msg = validate_products_df(df.copy(), fleet)
+    if not ok:
+        return False, msg, None, None
+    df.columns = [c.strip().lower() for c in df.columns]
+    return True, "", df, build_products_from_df(df.copy())
+
+def solve_key(fleet_df: pd.DataFrame, products: List[Product], distancia_global_km: float) -> str:
+    # Huella de la entrada ya normalizada: peticiones equivalentes comparten llave
+    payload = {
+        "flota": [
+            [str(r["tipo_camion"]).strip(), float(r["capacidad_kg"]), float(r["tarifa_km"]), int(r["cantidad"])]
+            for r in fleet_df.to_dict(orient="records")
+        ],
+        "productos": [[p.nombre, p.peso, p.valor, p.cantidad] for p in products],
+        "distancia_km": float(distancia_global_km),
+    }
+    raw = json.dumps(payload, ensure_ascii=False, sort_keys=True)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+def metrics_payload(products: List[Product], fleet: Fleet, x_sol: Dict[Tuple[int, int], int]) -> Dict[str, Any]:
+    df_metrics = compute_metrics_df(products, fleet.vehicles, x_sol)
+    kg_totales, pct_general, costo_total, valor_total = compute_totals(df_metrics)
+    return {
+        "metricas": df_metrics.to_dict(orient="records"),
+        "totales": {
+            "kg_totales": kg_totales,
+            "porcentaje_capacidad": pct_general,
+            "costo_total": costo_total,
+            "valor_total": valor_total,
+        },
+    }
+
+def solve_payload(products: List[Product], fleet: Fleet, time_limit: float | None = None) -> Dict[str, Any]:
+    result = Optimizer(products, fleet, time_limit=time_limit).build_and_solve()
+    # PuLP reporta "Optimal" también si CBC se detuvo por tiempo con un incumbente
+    payload: Dict[str, Any] = {
+        "status": result.status,
+        "sol_status": result.sol_status,
+        "optimo_probado": result.sol_status == "Optimal Solution Found",
+    }
+    if result.status not in ("Optimal", "Feasible"):
+        return payload
+    payload["plan"] = build_plan_text(products, fleet.vehicles, result.x)
+    payload["asignaciones"] = [
+        {
+            "vehiculo_id": fleet.vehicles[j].id,
+            "tipo": fleet.vehicles[j].tipo,
+            "producto": products[i].nombre,
+            "cantidad": units,
+        }
+        for (i, j), units in sorted(result.x.items(), key=lambda kv: (kv[0][1], kv[0][0]))
+    ]
+    payload.update(metrics_payload(products, fleet, result.x))
+    return payload
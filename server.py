@@ -0,0 +1,300 @@
+import argparse
+import base64
+import json
+import math
+import time
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from email.parser import BytesParser
+from email.policy import HTTP
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Tuple
+
+import pandas as pd
+
+from models.io_utils import read_table
+from models.validators import validate_extension
+from models.service import (
+    ServiceBusy,
+    SolveService,
+    prepare_fleet,
+    prepare_products,
+    solve_key,
+    solve_payload,
+    metrics_payload,
+)
+
+MAX_BODY_BYTES = 20 * 1024 * 1024
+
+
+class HttpError(Exception):
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+# --- Entrada: archivos subidos (multipart) o JSON ---
+def _parse_multipart(content_type: str, body: bytes) -> Dict[str, Any]:
+    msg = BytesParser(policy=HTTP).parsebytes(
+        f"Content-Type: {content_type}\r\n\r\n".encode("latin1") + body
+    )
+    if not msg.is_multipart():
+        raise HttpError(400, "Cuerpo multipart no válido.")
+    fields: Dict[str, Any] = {}
+    for part in msg.iter_parts():
+        name = part.get_param("name", header="content-disposition")
+        if not name:
+            continue
+        data = part.get_payload(decode=True) or b""
+        file_name = part.get_filename()
+        if file_name is not None:
+            fields[name] = {"file_name": file_name, "content": data}
+        else:
+            try:
+                fields[name] = data.decode("utf-8")
+            except UnicodeDecodeError:
+                raise HttpError(400, f"El campo {name} no está en UTF-8.")
+    return fields
+
+
+def _table_from_field(value: Any) -> pd.DataFrame:
+    # Archivo: {"file_name", "content"|"content_base64"}; JSON: lista de filas
+    if value is None or value == "":
+        raise HttpError(422, "No se ha cargado ningún archivo.")
+    if isinstance(value, list):
+        if not value:
+            raise HttpError(422, "No se ha cargado ningún archivo.")
+        if not all(isinstance(fila, dict) for fila in value):
+            raise HttpError(400, "Tabla no válida: cada fila debe ser un objeto JSON.")
+        return pd.DataFrame(value)
+    if isinstance(value, dict):
+        file_name = str(value.get("file_name", ""))
+        ok, msg = validate_extension(file_name)
+        if not ok:
+            raise HttpError(422, msg)
+        if "content" in value:
+            # Contenido crudo solo llega desde multipart; en JSON se usa content_base64
+            content = value["content"]
+            if not isinstance(content, bytes):
+                raise HttpError(400, "Envíe el archivo en content_base64.")
+        else:
+            try:
+                content = base64.b64decode(value.get("content_base64", ""), validate=True)
+            except ValueError:
+                raise HttpError(400, "content_base64 no válido.")
+        if not content:
+            raise HttpError(422, "No se ha cargado ningún archivo.")
+        try:
+            return read_table(content, file_name)
+        except (UnicodeDecodeError, ValueError) as e:
+            raise HttpError(422, str(e))
+    raise HttpError(400, "Tabla no válida: envíe un archivo o una lista de filas.")
+
+
+def _distancia(fields: Dict[str, Any]) -> float:
+    try:
+        distancia = float(fields.get("distancia_km", 0) or 0)
+    except (TypeError, ValueError):
+        distancia = 0.0
+    if not math.isfinite(distancia) or distancia <= 0:
+        raise HttpError(
+            422,
+            "Debes ingresar una distancia mayor a 0 km en el campo "
+            "'Distancia (km) que recorrerán todos los camiones'.",
+        )
+    return distancia
+
+
+def _fleet(fields: Dict[str, Any]):
+    distancia = _distancia(fields)
+    ok, msg, fleet_df, fleet = prepare_fleet(_table_from_field(fields.get("flota")), distancia)
+    if not ok:
+        raise HttpError(422, msg)
+    return distancia, fleet_df, fleet
+
+
+def _products(fields: Dict[str, Any], fleet):
+    ok, msg, products_df, products = prepare_products(_table_from_field(fields.get("productos")), fleet)
+    if not ok:
+        raise HttpError(422, msg)
+    return products_df, products
+
+
+def _records(df: pd.DataFrame):
+    return df.astype(object).where(df.notna(), None).to_dict(orient="records")
+
+
+class SolveHandler(BaseHTTPRequestHandler):
+    service: SolveService = None  # se asigna en make_server
+    solve_time_limit: float | None = 60.0  # límite de CBC por resolución
+    request_timeout: float = 300.0         # espera máxima del cliente (cola + resolución)
+
+    # --- Endpoints ---
+    def get_health(self, fields):
+        return 200, {"ok": True}
+
+    def get_metrics(self, fields):
+        return 200, self.service.snapshot()
+
+    def post_read_table(self, fields):
+        df = _table_from_field(fields.get("archivo"))
+        return 200, {"ok": True, "columnas": [str(c) for c in df.columns], "filas": _records(df)}
+
+    def post_validate_fleet(self, fields):
+        _, fleet_df, fleet = _fleet(fields)
+        return 200, {
+            "ok": True,
+            "message": "Archivo cargado correctamente.",
+            "flota": _records(fleet_df),
+            "vehiculos": len(fleet.vehicles),
+            "capacidad_total": fleet.capacidad_total,
+        }
+
+    def post_validate_products(self, fields):
+        _, _, fleet = _fleet(fields)
+        products_df, _ = _products(fields, fleet)
+        return 200, {"ok": True, "message": "", "productos": _records(products_df)}
+
+    def post_solve(self, fields):
+        distancia, fleet_df, fleet = _fleet(fields)
+        _, products = _products(fields, fleet)
+        key = solve_key(fleet_df, products, distancia)
+        try:
+            fut = self.service.submit(
+                key,
+                lambda: solve_payload(products, fleet, self.solve_time_limit),
+                # Solo óptimos probados: lo cortado por el límite de tiempo depende de la carga
+                cache_if=lambda payload: payload["optimo_probado"],
+            )
+        except ServiceBusy as e:
+            raise HttpError(503, str(e))
+        try:
+            payload = fut.result(timeout=self.request_timeout)
+        except FutureTimeoutError:
+            raise HttpError(504, "La optimización no terminó a tiempo, intente más tarde.")
+        if payload["status"] not in ("Optimal", "Feasible"):
+            return 422, {"ok": False, "status": payload["status"],
+                         "message": "No fue posible encontrar una solución factible."}
+        return 200, dict(payload, ok=True)
+
+    def post_compute_metrics(self, fields):
+        _, _, fleet = _fleet(fields)
+        _, products = _products(fields, fleet)
+        idx_veh = {v.id: j for j, v in enumerate(fleet.vehicles)}
+        idx_prod = {p.nombre: i for i, p in enumerate(products)}
+        asignaciones = fields.get("asignaciones") or []
+        if isinstance(asignaciones, str):  # campo de formulario multipart
+            try:
+                asignaciones = json.loads(asignaciones)
+            except json.JSONDecodeError:
+                raise HttpError(400, "JSON no válido.")
+        if not isinstance(asignaciones, list) or not all(isinstance(a, dict) for a in asignaciones):
+            raise HttpError(400, "asignaciones debe ser una lista de objetos JSON.")
+        x_sol: Dict[Tuple[int, int], int] = {}
+        for a in asignaciones:
+            try:
+                i = idx_prod[str(a["producto"]).strip().lower()]
+                j = idx_veh[str(a["vehiculo_id"])]
+                units = int(a["cantidad"])
+            except (KeyError, TypeError, ValueError):
+                raise HttpError(422, f"Asignación no válida: {a}")
+            if units <= 0:
+                raise HttpError(422, f"En la columna cantidad no se puede estipular el valor '{a['cantidad']}'.")
+            x_sol[(i, j)] = x_sol.get((i, j), 0) + units
+        return 200, dict(metrics_payload(products, fleet, x_sol), ok=True)
+
+    ROUTES = {
+        ("GET", "/health"): get_health,
+        ("GET", "/metrics"): get_metrics,
+        ("POST", "/read_table"): post_read_table,
+        ("POST", "/validate/fleet"): post_validate_fleet,
+        ("POST", "/validate/products"): post_validate_products,
+        ("POST", "/solve"): post_solve,
+        ("POST", "/compute_metrics"): post_compute_metrics,
+    }
+
+    # --- Despacho ---
+    def _read_fields(self) -> Dict[str, Any]:
+        if self.command != "POST":
+            return {}
+        try:
+            length = int(self.headers.get("Content-Length") or 0)
+        except ValueError:
+            length = -1
+        if length < 0:
+            raise HttpError(400, "Content-Length no válido.")
+        if length > MAX_BODY_BYTES:
+            raise HttpError(413, "El archivo es demasiado grande.")
+        body = self.rfile.read(length)
+        content_type = self.headers.get("Content-Type", "")
+        if content_type.startswith("multipart/form-data"):
+            return _parse_multipart(content_type, body)
+        try:
+            fields = json.loads(body or b"{}")
+        except json.JSONDecodeError:
+            raise HttpError(400, "JSON no válido.")
+        if not isinstance(fields, dict):
+            raise HttpError(400, "JSON no válido.")
+        return fields
+
+    def _dispatch(self):
+        path = self.path.split("?", 1)[0].rstrip("/") or "/"
+        route = self.ROUTES.get((self.command, path))
+        t0 = time.perf_counter()
+        try:
+            if route is None:
+                raise HttpError(404, "Ruta no encontrada.")
+            status, payload = route(self, self._read_fields())
+        except HttpError as e:
+            status, payload = e.status, {"ok": False, "message": e.message}
+        except Exception as e:
+            status, payload = 500, {"ok": False, "message": f"Error interno: {e}"}
+        if route is not None:
+            self.service.stats.observe(f"{self.command} {path}", time.perf_counter() - t0)
+        body = json.dumps(payload, ensure_ascii=False, default=str).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    do_GET = _dispatch
+    do_POST = _dispatch
+
+
+def make_server(host: str = "127.0.0.1", port: int = 8765, workers: int = 2,
+                max_queue: int = 32, cache_size: int = 128,
+                solve_time_limit: float | None = 60.0, request_timeout: float = 300.0) -> ThreadingHTTPServer:
+    handler = type("BoundSolveHandler", (SolveHandler,), {
+        "service": SolveService(max_workers=workers, max_queue=max_queue, cache_size=cache_size),
+        "solve_time_limit": solve_time_limit,
+        "request_timeout": request_timeout,
+    })
+    return ThreadingHTTPServer((host, port), handler)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Servicio HTTP/JSON local de TruckOptimizer")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--workers", type=int, default=2, help="Resoluciones MILP simultáneas")
+    parser.add_argument("--max-queue", type=int, default=32, help="Resoluciones en espera antes de responder 503")
+    parser.add_argument("--cache-size", type=int, default=128, help="Resultados recientes en caché")
+    parser.add_argument("--solve-time-limit", type=float, default=60.0, help="Límite de CBC por resolución (s)")
+    parser.add_argument("--request-timeout", type=float, default=300.0, help="Espera máxima por /solve antes de responder 504 (s)")
+    args = parser.parse_args()
+
+    server = make_server(args.host, args.port, args.workers, args.max_queue, args.cache_size,
+                         args.solve_time_limit, args.request_timeout)
+    print(f"TruckOptimizer API en http://{args.host}:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        server.RequestHandlerClass.service.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+import pandas as pd
+import pytest
+
+from benchmarks.generator import SCENARIOS, STRESS_SCENARIOS, generate_instance
+from benchmarks.run import (
+    BenchmarkError,
+    STAGES,
+    check_meta,
+    compare,
+    coverage,
+    main,
+    merge_baseline,
+    peor_repeticion,
+)
+from models.io_utils import build_fleet_from_df, normalize_fleet_columns, to_internal_fleet_columns
+from models.validators import validate_fleet_df, validate_products_df
+
+META = {"python": "3.11", "platform": "x", "pulp": "2.7.0", "pandas": "2.2.3", "numpy": "2.2",
+        "seed": 0, "repeat": 3, "time_limit": 20.0}
+
+
+def _scenario(solve=1.0, limite=False, costo=100.0, sol_status="Optimal Solution Found", **stages):
+    tiempos = dict.fromkeys(STAGES, 0.01)
+    tiempos.update(solve=solve, **stages)
+    return {"status": "Optimal", "sol_status": sol_status, "limite_alcanzado": limite,
+            "costo_total": costo, "stages": tiempos}
+
+
+def _run(**scenarios):
+    return {"meta": dict(META), "scenarios": scenarios}
+
+
+def _compare(actual, baseline):
+    return compare(actual, baseline, tolerance=0.5, min_delta=0.1, cost_tolerance=1e-6)
+
+
+# --- compare ---
+def test_identical_runs_have_no_regressions():
+    assert _compare(_run(a=_scenario()), _run(a=_scenario())) == []
+
+
+def test_slower_stage_fails_only_beyond_tolerance_and_min_delta():
+    base = _run(a=_scenario(model_build=0.5))
+    assert _compare(_run(a=_scenario(model_build=0.7)), base) == []      # +40%
+    assert _compare(_run(a=_scenario(model_build=0.55, read_table=0.05)), base) == []  # +400% pero < min_delta
+    fallas = _compare(_run(a=_scenario(model_build=1.0)), base)
+    assert len(fallas) == 1 and fallas[0].startswith("a/model_build")
+
+
+def test_capped_baseline_skips_solve_timing_but_not_other_stages():
+    base = _run(a=_scenario(solve=20.0, limite=True, costo=None, sol_status="No Solution Found"))
+    cur = _run(a=_scenario(solve=60.0, limite=True, costo=None, sol_status="No Solution Found", model_build=5.0))
+    fallas = _compare(cur, base)
+    assert len(fallas) == 1 and fallas[0].startswith("a/model_build")
+
+
+def test_newly_hitting_time_limit_fails():
+    cur = _run(a=_scenario(solve=1.2, limite=True, costo=120.0, sol_status="Solution Found"))
+    fallas = _compare(cur, _run(a=_scenario()))
+    assert any("límite de tiempo" in f for f in fallas)
+    assert not any("costo_total" in f for f in fallas)  # un incumbente no se compara contra un óptimo
+
+
+def test_cost_compared_only_between_proven_optima():
+    assert any("costo_total" in f for f in _compare(_run(a=_scenario(costo=101.0)), _run(a=_scenario())))
+    # Baseline cortado por tiempo: su costo no es de referencia
+    base = _run(a=_scenario(solve=20.0, limite=True, costo=90.0, sol_status="Solution Found"))
+    assert _compare(_run(a=_scenario(costo=100.0)), base) == []
+
+
+def test_lost_solution_fails():
+    cur = _run(a=_scenario(costo=None, sol_status="No Solution Exists"))
+    assert _compare(cur, _run(a=_scenario())) == ["a: No Solution Exists vs baseline Optimal Solution Found"]
+
+
+# --- check_meta / coverage / merge ---
+def test_check_meta_splits_strict_and_warning_keys():
+    actual = _run()
+    actual["meta"].update(pulp="3.3.2", numpy="1.0", repeat=1)
+    errores, avisos = check_meta(actual, _run())
+    assert [e.split(":")[0] for e in errores] == ["pulp"]
+    assert sorted(a.split(":")[0] for a in avisos) == ["numpy", "repeat"]
+    for clave in ("seed", "time_limit"):
+        otro = _run()
+        otro["meta"][clave] = 99
+        assert check_meta(otro, _run())[0]
+
+
+def test_coverage_reports_both_sides():
+    assert coverage(_run(a=_scenario(), b=_scenario()), _run(b=_scenario(), c=_scenario())) == (["a"], ["c"])
+
+
+def test_merge_keeps_scenarios_not_in_partial_run():
+    nuevo = merge_baseline(_run(a=_scenario(solve=2.0)), _run(a=_scenario(), b=_scenario()))
+    assert set(nuevo["scenarios"]) == {"a", "b"}
+    assert nuevo["scenarios"]["a"]["stages"]["solve"] == 2.0
+
+
+def test_merge_refuses_partial_run_with_incompatible_meta():
+    actual = _run(a=_scenario())
+    actual["meta"]["seed"] = 1
+    with pytest.raises(BenchmarkError):
+        merge_baseline(actual, _run(a=_scenario(), b=_scenario()))
+    # Una corrida completa sí reemplaza el baseline
+    assert merge_baseline(actual, _run(a=_scenario()))["meta"]["seed"] == 1
+
+
+def test_worst_repetition_is_reported_whole():
+    optima = dict(_scenario(), costo_total=100.0)
+    cortada = dict(_scenario(limite=True, costo=120.0, sol_status="Solution Found"))
+    assert peor_repeticion([optima, cortada, optima]) is cortada
+
+
+def test_repeat_must_be_positive():
+    with pytest.raises(SystemExit) as e:
+        main(["--repeat", "0", "--scenarios", "template"])
+    assert e.value.code == 2
+
+
+# --- generador ---
+@pytest.mark.parametrize("sc", SCENARIOS + STRESS_SCENARIOS, ids=lambda sc: sc.nombre)
+def test_generator_is_deterministic(sc):
+    flota_a, productos_a = generate_instance(sc, seed=7)
+    flota_b, productos_b = generate_instance(sc, seed=7)
+    pd.testing.assert_frame_equal(flota_a, flota_b)
+    pd.testing.assert_frame_equal(productos_a, productos_b)
+    assert not generate_instance(sc, seed=8)[1].equals(productos_a)
+
+
+@pytest.mark.parametrize("sc", SCENARIOS + STRESS_SCENARIOS, ids=lambda sc: sc.nombre)
+def test_scenarios_pass_validators(sc):
+    flota, productos = generate_instance(sc, seed=0)
+    flota = normalize_fleet_columns(flota)
+    assert validate_fleet_df(flota.copy()) == (True, "")
+    fleet = build_fleet_from_df(to_internal_fleet_columns(flota), distancia_global_km=100.0)
+    assert len(fleet.vehicles) == sc.n_camiones
+    assert validate_products_df(productos.copy(), fleet) == (True, "")
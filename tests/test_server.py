@@ -0,0 +1,170 @@
+import base64
+import http.client
+import json
+import threading
+from pathlib import Path
+
+import pytest
+
+from server import HttpError, _table_from_field, make_server
+
+FLOTA_CSV = b"tipo de camion,peso que puede cargar (kg),tarifa por kilometro recorrido,cantidad\nmediano,3000,1.8,2\n"
+
+
+def test_table_from_rows_and_base64():
+    df = _table_from_field([{"Tipo": "mediano", "Capacidad": 3000}])
+    assert list(df.columns) == ["Tipo", "Capacidad"]
+    df = _table_from_field({"file_name": "f.csv", "content_base64": base64.b64encode(FLOTA_CSV).decode()})
+    assert len(df) == 1
+
+
+@pytest.mark.parametrize("value", [
+    [1, 2],
+    [{"a": 1}, "b"],
+    {"file_name": "a.csv", "content": "a,b\n1,2"},
+    {"file_name": "a.csv", "content_base64": "no es base64!"},
+    42,
+])
+def test_malformed_tables_are_client_errors(value):
+    with pytest.raises(HttpError) as e:
+        _table_from_field(value)
+    assert e.value.status == 400
+
+
+def test_missing_or_wrong_extension_is_unprocessable():
+    with pytest.raises(HttpError) as e:
+        _table_from_field(None)
+    assert (e.value.status, e.value.message) == (422, "No se ha cargado ningún archivo.")
+    with pytest.raises(HttpError) as e:
+        _table_from_field({"file_name": "a.txt", "content_base64": ""})
+    assert (e.value.status, e.value.message) == (422, "Formato o extensión de archivo no válido.")
+
+
+# --- Capa HTTP ---
+TEMPLATES = Path(__file__).resolve().parent.parent / "assets" / "templates"
+
+
+def _solve_body(distancia=100):
+    return {
+        "distancia_km": distancia,
+        "flota": {"file_name": "flota.csv",
+                  "content_base64": base64.b64encode((TEMPLATES / "flota_template.csv").read_bytes()).decode()},
+        "productos": {"file_name": "productos.csv",
+                      "content_base64": base64.b64encode((TEMPLATES / "productos_template.csv").read_bytes()).decode()},
+    }
+
+
+@pytest.fixture
+def serve():
+    servers = []
+
+    def start(**kwargs):
+        srv = make_server(port=0, **kwargs)
+        threading.Thread(target=srv.serve_forever, daemon=True).start()
+        servers.append(srv)
+        return srv.server_address[1]
+
+    yield start
+    for srv in servers:
+        srv.shutdown()
+        srv.server_close()
+        srv.RequestHandlerClass.service.shutdown()
+
+
+def _request(port, method, path, body=None, headers=None):
+    conn = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+    data = json.dumps(body).encode("utf-8") if isinstance(body, dict) else body
+    conn.request(method, path, body=data, headers=headers or {})
+    resp = conn.getresponse()
+    payload = json.loads(resp.read())
+    conn.close()
+    return resp.status, payload
+
+
+def test_solve_round_trip_and_metrics(serve):
+    port = serve()
+    status, payload = _request(port, "POST", "/solve", _solve_body())
+    assert status == 200
+    assert (payload["status"], payload["sol_status"], payload["optimo_probado"]) == ("Optimal", "Optimal Solution Found", True)
+    assert payload["totales"]["kg_totales"] == pytest.approx(sum(m["kg_usados"] for m in payload["metricas"]))
+    assert sum(a["cantidad"] for a in payload["asignaciones"]) == 446
+
+    status, _ = _request(port, "POST", "/solve", _solve_body())
+    assert status == 200
+    status, metrics = _request(port, "GET", "/metrics")
+    assert status == 200
+    assert (metrics["queue_depth"], metrics["running"], metrics["cache_size"]) == (0, 0, 1)
+    assert (metrics["cache"]["misses"], metrics["cache"]["hits"]) == (1, 1)
+    assert metrics["latency_seconds"]["POST /solve"]["count"] == 2
+    assert metrics["latency_seconds"]["solve"]["buckets"]["+Inf"] == 1
+
+
+def test_full_queue_returns_503(serve):
+    port = serve(max_queue=0)
+    status, payload = _request(port, "POST", "/solve", _solve_body())
+    assert status == 503
+    assert payload["ok"] is False
+
+
+def test_request_timeout_returns_504(serve):
+    port = serve(request_timeout=0)
+    status, payload = _request(port, "POST", "/solve", _solve_body())
+    assert status == 504
+    assert payload["message"] == "La optimización no terminó a tiempo, intente más tarde."
+
+
+@pytest.mark.parametrize("distancia", [0, -5, "nan", "inf", "abc"])
+def test_invalid_distance_uses_ui_message(serve, distancia):
+    port = serve()
+    status, payload = _request(port, "POST", "/solve", _solve_body(distancia))
+    assert status == 422
+    assert payload["message"] == ("Debes ingresar una distancia mayor a 0 km en el campo "
+                                  "'Distancia (km) que recorrerán todos los camiones'.")
+
+
+def test_validation_messages_match_ui(serve):
+    port = serve()
+    body = _solve_body()
+    body["productos"] = [{"Producto": "neveras", "Peso": 70, "Valor": 1, "Cantidad": 1},
+                         {"Producto": "neveras", "Peso": 70, "Valor": 1, "Cantidad": 1}]
+    status, payload = _request(port, "POST", "/validate/products", body)
+    assert (status, payload["message"]) == (422, "Existen productos duplicados")
+
+
+@pytest.mark.parametrize("asignaciones, expected", [
+    (5, 400),
+    ({"producto": "neveras"}, 400),
+    ([1], 400),
+    ([{"vehiculo_id": "mediano-1", "producto": "neveras", "cantidad": -2}], 422),
+    ([{"vehiculo_id": "mediano-1", "producto": "neveras", "cantidad": 0}], 422),
+    ([{"vehiculo_id": "no-existe", "producto": "neveras", "cantidad": 1}], 422),
+])
+def test_compute_metrics_rejects_malformed_assignments(serve, asignaciones, expected):
+    port = serve()
+    status, _ = _request(port, "POST", "/compute_metrics", dict(_solve_body(), asignaciones=asignaciones))
+    assert status == expected
+
+
+def test_compute_metrics_round_trip(serve):
+    port = serve()
+    body = dict(_solve_body(), asignaciones=[{"vehiculo_id": "mediano-1", "producto": "neveras", "cantidad": 2}])
+    status, payload = _request(port, "POST", "/compute_metrics", body)
+    assert status == 200
+    assert payload["metricas"][0]["kg_usados"] == 140.0
+
+
+@pytest.mark.parametrize("length", ["abc", "-1"])
+def test_bad_content_length_is_rejected(serve, length):
+    port = serve()
+    status, _ = _request(port, "POST", "/solve", b"{}", headers={"Content-Length": length})
+    assert status == 400
+
+
+def test_non_utf8_multipart_field_is_rejected(serve):
+    port = serve()
+    boundary = "xyz"
+    body = (f"--{boundary}\r\nContent-Disposition: form-data; name=\"distancia_km\"\r\n\r\n".encode()
+            + b"\xff\xfe" + f"\r\n--{boundary}--\r\n".encode())
+    status, _ = _request(port, "POST", "/solve", body,
+                         headers={"Content-Type": f"multipart/form-data; boundary={boundary}"})
+    assert status == 400
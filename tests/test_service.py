@@ -0,0 +1,118 @@
+import threading
+import time
+
+import pytest
+
+from models.service import ServiceBusy, SolveService
+
+
+def _wait_for(cond, timeout=5.0):
+    t0 = time.perf_counter()
+    while not cond():
+        if time.perf_counter() - t0 > timeout:
+            raise AssertionError("condición no alcanzada a tiempo")
+        time.sleep(0.005)
+
+
+def _blocking(calls, release, result):
+    def fn():
+        calls.append(result)
+        release.wait(5)
+        return result
+    return fn
+
+
+def test_identical_concurrent_requests_are_coalesced():
+    service = SolveService(max_workers=2, max_queue=4)
+    calls, release = [], threading.Event()
+    fn = _blocking(calls, release, {"status": "Optimal"})
+    futures = []
+
+    def submit():
+        futures.append(service.submit("k", fn))
+
+    threads = [threading.Thread(target=submit) for _ in range(5)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    _wait_for(lambda: service.snapshot()["running"] == 1)
+    release.set()
+
+    assert [f.result(timeout=5) for f in futures] == [{"status": "Optimal"}] * 5
+    assert len(calls) == 1
+    snap = service.snapshot()
+    assert snap["cache"]["misses"] == 1
+    assert snap["cache"]["coalesced"] == 4
+    service.shutdown()
+
+
+def test_full_queue_rejects_new_keys():
+    service = SolveService(max_workers=1, max_queue=1)
+    calls, release = [], threading.Event()
+    running = service.submit("a", _blocking(calls, release, "a"))
+    _wait_for(lambda: service.snapshot()["running"] == 1)
+    queued = service.submit("b", _blocking(calls, release, "b"))
+    assert service.snapshot()["queue_depth"] == 1
+
+    with pytest.raises(ServiceBusy):
+        service.submit("c", _blocking(calls, release, "c"))
+    # Una llave ya en cola se coalesce aunque la cola esté llena
+    assert service.submit("b", _blocking(calls, release, "b")) is queued
+
+    release.set()
+    assert running.result(timeout=5) == "a"
+    assert queued.result(timeout=5) == "b"
+    _wait_for(lambda: service.snapshot()["in_flight"] == 0)
+    snap = service.snapshot()
+    assert (snap["queue_depth"], snap["running"], snap["rejected"]) == (0, 0, 1)
+    service.shutdown()
+
+
+def test_cache_evicts_least_recently_used():
+    service = SolveService(max_workers=1, cache_size=2)
+    calls = []
+
+    def solve(key):
+        service.submit(key, lambda: calls.append(key) or key).result(timeout=5)
+        _wait_for(lambda: service.snapshot()["in_flight"] == 0)
+
+    for key in ("a", "b", "a", "c"):  # "a" se reutiliza, así que sale "b"
+        solve(key)
+    assert calls == ["a", "b", "c"]
+    assert service.snapshot()["cache_size"] == 2
+
+    solve("a")
+    solve("b")
+    assert calls == ["a", "b", "c", "b"]
+    assert service.snapshot()["cache"]["hits"] == 2
+    service.shutdown()
+
+
+def test_failed_solve_is_not_cached():
+    service = SolveService(max_workers=1)
+
+    def boom():
+        raise RuntimeError("falla")
+
+    with pytest.raises(RuntimeError):
+        service.submit("k", boom).result(timeout=5)
+    _wait_for(lambda: service.snapshot()["in_flight"] == 0)
+    assert service.submit("k", lambda: "ok").result(timeout=5) == "ok"
+    service.shutdown()
+
+
+def test_cache_if_skips_uncacheable_results():
+    service = SolveService(max_workers=1)
+    calls = []
+
+    def solve():
+        calls.append(1)
+        return {"status": "Not Solved"}
+
+    for _ in range(2):
+        service.submit("k", solve, cache_if=lambda r: r["status"] != "Not Solved").result(timeout=5)
+        _wait_for(lambda: service.snapshot()["in_flight"] == 0)
+    assert len(calls) == 2
+    assert service.snapshot()["cache_size"] == 0
+    service.shutdown()